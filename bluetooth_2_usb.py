@@ -119,8 +119,8 @@ async def main() -> None:
         relay_task = asyncio.create_task(relay_controller.async_relay_devices())
         await shutdown_event.wait()
 
-        logger.debug("Shutdown event triggered. Cancelling relay task...")
-        relay_task.cancel()
+        logger.debug("Shutdown event triggered. Stopping relay controller...")
+        relay_controller.stop()
         await asyncio.gather(relay_task, return_exceptions=True)
 
 
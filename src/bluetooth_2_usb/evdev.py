@@ -1475,20 +1475,37 @@ _MOUSE_BUTTONS = set(
 
 def evdev_to_usb_hid(event: KeyEvent) -> tuple[int | None, str | None]:
     scancode: int = event.scancode
-    key_name = find_key_name(event)
-    hid_usage_id = _EVDEV_TO_USB_HID.get(scancode, None)
-    hid_usage_name = find_usage_name(event, hid_usage_id)
+    key_name, hid_usage_id, hid_usage_name = _convert_scancode(scancode)
     if any(item is None for item in (key_name, hid_usage_id, hid_usage_name)):
         _logger.warning(f"Unsupported key pressed: 0x{scancode:02X}")
     else:
         _logger.debug(
-            f"Converted evdev scancode 0x{scancode:02X} ({key_name}) to HID UsageID 0x{hid_usage_id:02X} ({hid_usage_name})"
+            "Converted evdev scancode 0x%02X (%s) to HID UsageID 0x%02X (%s)",
+            scancode,
+            key_name,
+            hid_usage_id,
+            hid_usage_name,
         )
     return hid_usage_id, hid_usage_name
 
 
+# Scancodes are bounded by KEY_CNT (0x300), so these caches never evict in practice
+@lru_cache(maxsize=1024)
+def _convert_scancode(scancode: int) -> tuple[str | None, int | None, str | None]:
+    hid_usage_id = _EVDEV_TO_USB_HID.get(scancode, None)
+    return (
+        _find_key_name(scancode),
+        hid_usage_id,
+        _find_usage_name(scancode, hid_usage_id),
+    )
+
+
 def find_key_name(event: KeyEvent) -> str | None:
-    scancode: int = event.scancode
+    return _find_key_name(event.scancode)
+
+
+@lru_cache(maxsize=1024)
+def _find_key_name(scancode: int) -> str | None:
     for attribute in _cached_dir(ecodes):
         if _cached_getattr(ecodes, attribute) == scancode and attribute.startswith(
             ("KEY_", "BTN_")
@@ -1498,7 +1515,11 @@ def find_key_name(event: KeyEvent) -> str | None:
 
 
 def find_usage_name(event: KeyEvent, hid_usage_id: int | None) -> str | None:
-    code_type = _get_hid_code_type(event)
+    return _find_usage_name(event.scancode, hid_usage_id)
+
+
+def _find_usage_name(scancode: int, hid_usage_id: int | None) -> str | None:
+    code_type = _get_hid_code_type(scancode)
     for attribute in _cached_dir(code_type):
         if _cached_getattr(code_type, attribute) == hid_usage_id:
             return attribute
@@ -1518,11 +1539,11 @@ def _cached_dir(
 
 
 def _get_hid_code_type(
-    event: KeyEvent,
+    scancode: int,
 ) -> type[ConsumerControlCode] | type[Keycode] | type[MouseButton]:
-    if is_consumer_key(event):
+    if scancode in _CONSUMER_KEYS:
         return ConsumerControlCode
-    elif is_mouse_button(event):
+    elif scancode in _MOUSE_BUTTONS:
         return MouseButton
     return Keycode
 
@@ -1,18 +1,28 @@
+from array import array
 import asyncio
 from asyncio import CancelledError, Task, TaskGroup
+from collections import deque
+import ctypes
+from dataclasses import dataclass
+from functools import lru_cache
+import itertools
 import json
+from logging import DEBUG
 import math
+from operator import sub
+import os
 from pathlib import Path
 import random
 import re
+import struct
 import time
-from typing import Any, Optional, Union
+from typing import Any, Callable, Iterable, Optional, Union
 
 from adafruit_hid.consumer_control import ConsumerControl
 from adafruit_hid.keyboard import Keyboard
 from adafruit_hid.keyboard_layout_us import KeyboardLayoutUS
 from adafruit_hid.mouse import Mouse
-from evdev import InputDevice, InputEvent, KeyEvent, RelEvent, categorize, list_devices
+from evdev import InputDevice, InputEvent, KeyEvent, RelEvent
 import pyudev
 import usb_hid
 from usb_hid import Device
@@ -27,8 +37,78 @@ from .evdev import (
 )
 from .logging import get_logger
 
+try:
+    # Optional faster parser, raises a subclass of json.JSONDecodeError
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 _logger = get_logger()
 
+_MOUSE_REPORT = struct.Struct("<Bbbb")
+"""Boot mouse HID report: buttons, x, y, wheel"""
+
+_CTRL_SCANCODES = frozenset((ecodes.KEY_LEFTCTRL, ecodes.KEY_RIGHTCTRL))
+"""Scancodes of the Ctrl keys"""
+
+_SHIFT_SCANCODES = frozenset((ecodes.KEY_LEFTSHIFT, ecodes.KEY_RIGHTSHIFT))
+"""Scancodes of the Shift keys"""
+
+_MAX_CONSECUTIVE_MOUSE_ERRORS = 5
+"""Consecutive failed mouse moves after which the movement pattern stops"""
+
+_MIN_REPORT_DELAY = 0.002
+"""Pattern delays (seconds) below this are batched into fewer, larger reports"""
+
+_BATCHED_REPORT_INTERVAL = 0.01
+"""Interval (seconds) between reports of such batched pattern steps"""
+
+_INOTIFY_EVENT = struct.Struct("iIII")
+"""Fixed part of struct inotify_event: wd, mask, cookie and name length"""
+
+_IN_MODIFY = 0x00000002
+_IN_IGNORED = 0x00008000
+
+_INPUT_DEVICE_DIR = "/dev/input"
+"""Directory holding the evdev device nodes (event0, event1, ...)"""
+
+_PATH_RE = re.compile(r"^/dev/input/event")
+"""Device identifiers given as an evdev device node path"""
+
+_MAC_RE = re.compile(r"^([0-9a-fA-F]{2}[:-]){5}([0-9a-fA-F]{2})$")
+"""Device identifiers given as a Bluetooth MAC address"""
+
+
+@dataclass(frozen=True, slots=True)
+class CircleParams:
+    """
+    Resolved parameters of one circular mouse movement cycle.
+    """
+
+    radius: float
+    steps: int
+
+
+@dataclass(frozen=True, slots=True)
+class ZigzagParams:
+    """
+    Resolved parameters of one horizontal zigzag mouse movement cycle.
+    """
+
+    width: float
+    height: float
+    steps: int
+
+
+@dataclass(frozen=True, slots=True)
+class SquareParams:
+    """
+    Resolved parameters of one square mouse movement cycle.
+    """
+
+    size: float
+    steps: int
+
 
 class GadgetManager:
     """
@@ -49,6 +129,7 @@ class GadgetManager:
             "keyboard_layout": None,
         }
         self._enabled = False
+        self._mouse_report_fd: Optional[int] = None
 
     def enable_gadgets(self) -> None:
         """
@@ -69,9 +150,59 @@ class GadgetManager:
         self._gadgets["mouse"] = Mouse(enabled_devices)
         self._gadgets["consumer"] = ConsumerControl(enabled_devices)
         self._enabled = True
+        self._open_mouse_report_fd()
 
         _logger.debug(f"USB HID gadgets re-initialized: {enabled_devices}")
 
+    def _open_mouse_report_fd(self) -> None:
+        """
+        Open the mouse's /dev/hidgX once, so movement reports can be written
+        directly instead of re-opening the device for every report.
+        Falls back to adafruit_hid if the device cannot be opened.
+        """
+        if self._mouse_report_fd is not None:
+            os.close(self._mouse_report_fd)
+            self._mouse_report_fd = None
+
+        try:
+            device_path = Device.BOOT_MOUSE.get_device_path()  # type: ignore
+            self._mouse_report_fd = os.open(device_path, os.O_RDWR | os.O_CLOEXEC)
+            _logger.debug(f"Writing mouse reports directly to {device_path}")
+        except Exception as ex:
+            _logger.debug(f"Could not open mouse HID device, using adafruit_hid: {ex}")
+
+    def move_mouse(self, x: int = 0, y: int = 0, wheel: int = 0) -> None:
+        """
+        Move the Mouse gadget, keeping the currently pressed buttons.
+        Like Mouse.move(), deltas beyond the report range are split
+        into multiple reports.
+
+        :param x: Horizontal movement
+        :param y: Vertical movement
+        :param wheel: Wheel movement
+        :raises RuntimeError: If Mouse gadget is not available
+        :raises BlockingIOError: If HID device write is blocked
+        """
+        mouse = self._gadgets["mouse"]
+        if mouse is None:
+            raise RuntimeError("Mouse gadget not initialized or manager not enabled.")
+
+        fd = self._mouse_report_fd
+        if fd is None:
+            mouse.move(x, y, wheel)
+            return
+
+        buttons = mouse.report[0]
+        while x or y or wheel:
+            partial_x = min(127, max(-127, x))
+            partial_y = min(127, max(-127, y))
+            partial_wheel = min(127, max(-127, wheel))
+            report = _MOUSE_REPORT.pack(buttons, partial_x, partial_y, partial_wheel)
+            os.write(fd, report)
+            x -= partial_x
+            y -= partial_y
+            wheel -= partial_wheel
+
     def get_keyboard(self) -> Optional[Keyboard]:
         """
         Get the Keyboard gadget.
@@ -125,7 +256,7 @@ class ShortcutToggler:
         :param relaying_active: An asyncio.Event controlling whether relaying is active
         :param gadget_manager: GadgetManager to release keyboard/mouse states on toggle
         """
-        self.shortcut_keys = shortcut_keys
+        self.shortcut_keys = frozenset(shortcut_keys)
         self.relaying_active = relaying_active
         self.gadget_manager = gadget_manager
 
@@ -147,7 +278,11 @@ class ShortcutToggler:
         elif event.keystate == KeyEvent.key_up:
             self.currently_pressed.discard(key_name)
 
-        if self.shortcut_keys and self.shortcut_keys.issubset(self.currently_pressed):
+        # Only a key that belongs to the shortcut can complete it
+        if (
+            key_name in self.shortcut_keys
+            and self.shortcut_keys <= self.currently_pressed
+        ):
             self.toggle_relaying()
 
     def toggle_relaying(self) -> None:
@@ -198,21 +333,24 @@ class RelayController:
         self._gadget_manager = gadget_manager
         self._device_ids = [DeviceIdentifier(id) for id in (device_identifiers or [])]
         self._auto_discover = auto_discover
-        self._skip_name_prefixes = skip_name_prefixes or ["vc4-hdmi"]
+        self._skip_name_prefixes = tuple(
+            prefix.lower() for prefix in (skip_name_prefixes or ["vc4-hdmi"])
+        )
         self._grab_devices = grab_devices
         self._relaying_active = relaying_active
         self._shortcut_toggler = shortcut_toggler
 
         self._active_tasks: dict[str, Task] = {}
         self._task_group: Optional[TaskGroup] = None
-        self._cancelled = False
+        self._cancel_event = asyncio.Event()
 
     async def async_relay_devices(self) -> None:
         """
         Launch a TaskGroup that relays events from all matching devices.
         Dynamically adds or removes tasks when devices appear or disappear.
 
-        :return: Never returns unless an unrecoverable exception or cancellation occurs
+        :return: Returns once stop() is called, or on an unrecoverable
+            exception or cancellation
         :rtype: None
         """
         try:
@@ -222,11 +360,12 @@ class RelayController:
 
                 for device in await async_list_input_devices():
                     if self._should_relay(device):
-                        self.add_device(device.path)
+                        self.add_device(device.path, device)
+                    else:
+                        device.close()
 
-                # Keep running unless canceled
-                while not self._cancelled:
-                    await asyncio.sleep(0.1)
+                # Keep running until stopped; device changes arrive via udev
+                await self._cancel_event.wait()
         except* Exception as exc_grp:
             _logger.exception(
                 "RelayController: Exception in TaskGroup", exc_info=exc_grp
@@ -235,28 +374,50 @@ class RelayController:
             self._task_group = None
             _logger.debug("RelayController: TaskGroup exited.")
 
-    def add_device(self, device_path: str) -> None:
+    def stop(self) -> None:
+        """
+        Cancel all relay tasks and let async_relay_devices() return.
+        Devices added after this are ignored.
+        """
+        for task in list(self._active_tasks.values()):
+            task.cancel()
+        self._cancel_event.set()
+
+    def add_device(
+        self, device_path: str, device: Optional[InputDevice] = None
+    ) -> None:
         """
         Add a device by path. If a TaskGroup is active, create a new relay task.
 
         :param device_path: The absolute path to the input device (e.g., /dev/input/event5)
+        :param device: The already opened InputDevice for device_path, if any
         """
-        if not Path(device_path).exists():
-            _logger.debug(f"{device_path} does not exist.")
+        if self._cancel_event.is_set():
+            # Shutting down, a new relay would keep the TaskGroup from exiting
+            _logger.debug(f"Stopping; ignoring {device_path}.")
+            if device is not None:
+                device.close()
             return
 
-        try:
-            device = InputDevice(device_path)
-        except (OSError, FileNotFoundError):
-            _logger.debug(f"{device_path} vanished before opening.")
-            return
+        if device is None:
+            if not Path(device_path).exists():
+                _logger.debug(f"{device_path} does not exist.")
+                return
+
+            try:
+                device = InputDevice(device_path)
+            except (OSError, FileNotFoundError):
+                _logger.debug(f"{device_path} vanished before opening.")
+                return
 
         if self._task_group is None:
             _logger.critical(f"No TaskGroup available; ignoring {device}.")
+            device.close()
             return
 
         if device.path in self._active_tasks:
             _logger.debug(f"Device {device} is already active.")
+            device.close()
             return
 
         task = self._task_group.create_task(
@@ -265,6 +426,15 @@ class RelayController:
         self._active_tasks[device.path] = task
         _logger.debug(f"Created task for {device}.")
 
+    def add_devices(self, device_paths: Iterable[str]) -> None:
+        """
+        Add several devices by path, see add_device().
+
+        :param device_paths: The absolute paths to the input devices
+        """
+        for device_path in sorted(device_paths):
+            self.add_device(device_path)
+
     def remove_device(self, device_path: str) -> None:
         """
         Cancel and remove the relay task for a given device path.
@@ -299,7 +469,9 @@ class RelayController:
         except Exception:
             _logger.exception(f"Unhandled exception in relay for {device}.")
         finally:
-            self.remove_device(device.path)
+            # The path may already belong to a new relay for a reused device node
+            if self._active_tasks.get(device.path) is asyncio.current_task():
+                del self._active_tasks[device.path]
 
     def _should_relay(self, device: InputDevice) -> bool:
         """
@@ -312,12 +484,11 @@ class RelayController:
         """
         name_lower = device.name.lower()
         if self._auto_discover:
-            for prefix in self._skip_name_prefixes:
-                if name_lower.startswith(prefix.lower()):
-                    return False
-            return True
+            return not name_lower.startswith(self._skip_name_prefixes)
 
-        return any(identifier.matches(device) for identifier in self._device_ids)
+        return any(
+            identifier.matches(device, name_lower) for identifier in self._device_ids
+        )
 
 
 class DeviceRelay:
@@ -351,15 +522,27 @@ class DeviceRelay:
 
         self._currently_grabbed = False
 
+        # Events are read by a reader callback registered in __aenter__
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event = asyncio.Event()
+        self._read_error: Optional[OSError] = None
+
+        # Key events queued by the reader callback for the tap sequence worker
+        self._pending_keys: deque[KeyEvent] = deque()
+        self._keys_pending = asyncio.Event()
+        self._tap_worker_task: Optional[asyncio.Task] = None
+
+        # Blocked HID writes, and everything relayed after them, in order
+        self._blocked_writes: deque[tuple[Callable[..., bool], tuple]] = deque()
+        self._retry_task: Optional[asyncio.Task] = None
+
         # Ctrl tap sequence detection for mouse movement patterns
-        self._ctrl_tap_times: list[float] = []
-        self._ctrl_tap_lock = asyncio.Lock()  # Prevent race conditions in tap detection
+        self._ctrl_tap_times: deque[float] = deque(maxlen=5)  # Last 5 tap times
         self._mouse_movement_task: Optional[asyncio.Task] = None
         self._mouse_movement_active = False
 
         # Shift+Ctrl combo tap sequence detection for poem output
         self._shift_ctrl_tap_times: list[float] = []
-        self._shift_ctrl_tap_lock = asyncio.Lock()  # Prevent race conditions in tap detection
         self._shift_pressed = False  # Track if Shift is currently held
         self._ctrl_pressed = False   # Track if Ctrl is currently held
         self._poem_output_task: Optional[asyncio.Task] = None
@@ -379,6 +562,17 @@ class DeviceRelay:
         else:
             self._current_pattern = default_pattern
 
+        # Pattern name -> (resolve cycle parameters, precompute cycle deltas).
+        # Delta tables are cached per parameters and must not be modified.
+        cached = lru_cache(maxsize=256)
+        self._pattern_dispatch = {
+            "circle": (self._resolve_circle, cached(self._precompute_circle_deltas)),
+            "zigzag": (self._resolve_zigzag, cached(self._precompute_zigzag_deltas)),
+            "square": (self._resolve_square, cached(self._precompute_square_deltas)),
+        }
+        # id(pattern config) -> parameters of configs without random ranges
+        self._fixed_pattern_params: dict[int, Any] = {}
+
         # For mix pattern: track timing
         self._mix_start_time: Optional[float] = None
 
@@ -401,7 +595,8 @@ class DeviceRelay:
 
     async def __aenter__(self) -> "DeviceRelay":
         """
-        Async context manager entry. Grabs the device if requested.
+        Async context manager entry. Grabs the device if requested and
+        starts reading its events from the event loop.
 
         :return: self
         """
@@ -411,14 +606,30 @@ class DeviceRelay:
                 self._currently_grabbed = True
             except Exception as ex:
                 _logger.warning(f"Could not grab {self._input_device.path}: {ex}")
+
+        self._stop_event.clear()
+        self._read_error = None
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._input_device.fd, self._on_readable)
+        self._tap_worker_task = asyncio.create_task(self._async_tap_worker())
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
         """
-        Async context manager exit. Ungrabs the device if we grabbed it.
+        Async context manager exit. Stops reading events and ungrabs
+        the device if we grabbed it.
 
         :return: False to propagate exceptions
         """
+        self._stop_reading()
+        if self._tap_worker_task is not None:
+            self._tap_worker_task.cancel()
+            await asyncio.gather(self._tap_worker_task, return_exceptions=True)
+            self._tap_worker_task = None
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            await asyncio.gather(self._retry_task, return_exceptions=True)
+        self._blocked_writes.clear()
         if self._grab_device:
             try:
                 self._input_device.ungrab()
@@ -429,51 +640,169 @@ class DeviceRelay:
 
     async def async_relay_events_loop(self) -> None:
         """
-        Continuously read events from the device and relay them
-        to the USB HID gadgets. Stops when canceled or on error.
+        Relay events from the device to the USB HID gadgets until
+        canceled or until reading from the device fails.
+
+        Events are read and relayed by a reader callback on the event loop,
+        so this only waits for the relay to stop.
 
         :return: None
+        :raises OSError: If reading from the device failed, e.g. it vanished
+        """
+        await self._stop_event.wait()
+        if self._read_error is not None:
+            raise self._read_error
+
+    def _stop_reading(self) -> None:
+        """
+        Unregister the reader callback of the input device, if any.
         """
-        async for input_event in self._input_device.async_read_loop():
-            event = categorize(input_event)
+        if self._loop is not None:
+            self._loop.remove_reader(self._input_device.fd)
+            self._loop = None
 
-            if any(isinstance(event, ev_type) for ev_type in [KeyEvent, RelEvent]):
+    async def _async_tap_worker(self) -> None:
+        """
+        Run the Ctrl and Shift+Ctrl tap sequence detection for the key events
+        queued by the reader callback, one at a time and in order.
+        """
+        pending_keys = self._pending_keys
+        while True:
+            await self._keys_pending.wait()
+            self._keys_pending.clear()
+            while pending_keys:
+                event = pending_keys.popleft()
+                try:
+                    if self._check_ctrl_tap_sequence(event):
+                        await self._toggle_mouse_movement()
+                    await self._check_shift_ctrl_tap_sequence(event)
+                except Exception:
+                    _logger.exception(f"Error in tap sequence detection for {event}")
+
+    def _on_readable(self) -> None:
+        """
+        Reader callback: drain all pending events from the device and relay
+        them synchronously. Tap sequence detection is handed to the tap worker,
+        and only blocked HID writes are retried, in order, in a task.
+        """
+        input_device = self._input_device
+        try:
+            input_events = list(input_device.read())
+        except BlockingIOError:
+            return
+        except OSError as ex:
+            # Surface the error from async_relay_events_loop
+            self._read_error = ex
+            self._stop_reading()
+            self._stop_event.set()
+            return
+
+        grab_device = self._grab_device
+        shortcut_toggler = self._shortcut_toggler
+        relaying_active = self._relaying_active
+        pending_keys = self._pending_keys
+        queued_keys = len(pending_keys)
+        # Relative movement is summed up and sent as one report per run
+        pending_x = pending_y = pending_wheel = 0
+
+        for input_event in input_events:
+            # Dispatch on the raw type; SYN, MSC etc. carry nothing to relay
+            event_type = input_event.type
+            if event_type == ecodes.EV_KEY:
+                # Unknown keycodes must not abort the rest of the batch
+                event = KeyEvent(input_event, allow_unknown=True)
+            elif event_type == ecodes.EV_REL:
+                event = RelEvent(input_event)
+            else:
+                continue
+
+            # Skip building the message entirely unless debug logging is on
+            if _logger.isEnabledFor(DEBUG):
                 _logger.debug(
-                    f"Received {event} from {self._input_device.name} ({self._input_device.path})"
+                    f"Received {event} from {input_device.name} ({input_device.path})"
                 )
 
-            # Check for Ctrl tap sequence (run without blocking)
-            if isinstance(event, KeyEvent):
-                asyncio.create_task(self._check_ctrl_tap_sequence(event))
-                # Check for Shift+Ctrl combo tap sequence (run without blocking)
-                asyncio.create_task(self._check_shift_ctrl_tap_sequence(event))
+            if event_type == ecodes.EV_KEY:
+                pending_keys.append(event)
+                if shortcut_toggler:
+                    shortcut_toggler.handle_key_event(event)
 
-            if self._shortcut_toggler and isinstance(event, KeyEvent):
-                self._shortcut_toggler.handle_key_event(event)
+            active = relaying_active is not None and relaying_active.is_set()
 
-            active = self._relaying_active and self._relaying_active.is_set()
+            # Movement read while relaying was still on goes out before it stops
+            if not active and (pending_x or pending_y or pending_wheel):
+                self._flush_mouse_movement(pending_x, pending_y, pending_wheel)
+                pending_x = pending_y = pending_wheel = 0
 
             # Dynamically grab/ungrab if relaying state changes
-            if self._grab_device and active and not self._currently_grabbed:
-                try:
-                    self._input_device.grab()
-                    self._currently_grabbed = True
-                    _logger.debug(f"Grabbed {self._input_device}")
-                except Exception as ex:
-                    _logger.warning(f"Could not grab {self._input_device}: {ex}")
-
-            elif self._grab_device and not active and self._currently_grabbed:
-                try:
-                    self._input_device.ungrab()
-                    self._currently_grabbed = False
-                    _logger.debug(f"Ungrabbed {self._input_device}")
-                except Exception as ex:
-                    _logger.warning(f"Could not ungrab {self._input_device}: {ex}")
+            if grab_device and active != self._currently_grabbed:
+                self._set_grabbed(active)
 
             if not active:
                 continue
 
-            await self._process_event_with_retry(event)
+            if event_type == ecodes.EV_REL:
+                x, y, wheel = get_mouse_movement(event)
+                pending_x += x
+                pending_y += y
+                pending_wheel += wheel
+                continue
+
+            # Move first so that button events apply at the right position
+            if pending_x or pending_y or pending_wheel:
+                self._flush_mouse_movement(pending_x, pending_y, pending_wheel)
+                pending_x = pending_y = pending_wheel = 0
+
+            self._relay_in_order(self._relay_event, event)
+
+        # Relaying can have been paused by a failed write since the last event
+        if (pending_x or pending_y or pending_wheel) and relaying_active.is_set():
+            self._flush_mouse_movement(pending_x, pending_y, pending_wheel)
+
+        if len(pending_keys) != queued_keys:
+            self._keys_pending.set()
+
+    def _flush_mouse_movement(self, x: int, y: int, wheel: int) -> None:
+        """
+        Relay summed up mouse movement, retrying in a task if the write blocked.
+
+        :param x: Horizontal movement
+        :param y: Vertical movement
+        :param wheel: Wheel movement
+        """
+        self._relay_in_order(self._relay_mouse_movement, x, y, wheel)
+
+    def _relay_in_order(self, relay: Callable[..., bool], *args: Any) -> None:
+        """
+        Relay right away unless earlier writes are still blocked. A blocked
+        write and everything after it are queued for the retry task, so the
+        host never sees e.g. a key release before the matching press.
+
+        :param relay: The relay method, returning False while the write is blocked
+        :param args: Arguments to the relay method
+        """
+        if not self._blocked_writes and relay(*args):
+            return
+        self._blocked_writes.append((relay, args))
+        if self._retry_task is None:
+            self._retry_task = asyncio.create_task(self._async_retry_blocked())
+
+    def _set_grabbed(self, grab: bool) -> None:
+        """
+        Grab or ungrab the input device to follow the relaying state.
+
+        :param grab: True to grab the device, False to ungrab it
+        """
+        try:
+            if grab:
+                self._input_device.grab()
+            else:
+                self._input_device.ungrab()
+            self._currently_grabbed = grab
+            _logger.debug(f"{'Grabbed' if grab else 'Ungrabbed'} {self._input_device}")
+        except Exception as ex:
+            action = "grab" if grab else "ungrab"
+            _logger.warning(f"Could not {action} {self._input_device}: {ex}")
 
     def _load_movement_config(self) -> dict[str, Any]:
         """Load mouse movement configuration from JSON file with fallback to defaults"""
@@ -482,8 +811,7 @@ class DeviceRelay:
 
         try:
             if config_path.exists():
-                with open(config_path, "r") as f:
-                    config = json.load(f)
+                config = _json_loads(config_path.read_bytes())
                 _logger.info(f"Loaded mouse movement config from {config_path}")
                 return config
             else:
@@ -514,9 +842,13 @@ class DeviceRelay:
             },
         }
 
+    def _is_config_range(self, value: Any) -> bool:
+        """Check whether a configuration value is a [min, max] random range"""
+        return isinstance(value, list) and len(value) == 2
+
     def _resolve_config_value(self, value: Union[int, float, list]) -> Union[int, float]:
         """Resolve configuration value - if it's a list [min, max], return random value in range"""
-        if isinstance(value, list) and len(value) == 2:
+        if self._is_config_range(value):
             min_val, max_val = value
             if isinstance(min_val, int) and isinstance(max_val, int):
                 return random.randint(min_val, max_val)
@@ -526,48 +858,43 @@ class DeviceRelay:
 
     def _is_ctrl_key(self, event: KeyEvent) -> bool:
         """Check if the event is a Ctrl key press"""
-        return event.scancode in (ecodes.KEY_LEFTCTRL, ecodes.KEY_RIGHTCTRL)
+        return event.scancode in _CTRL_SCANCODES
 
-    async def _check_ctrl_tap_sequence(self, event: KeyEvent) -> None:
-        """Detect 5 Ctrl taps within 3 seconds to toggle mouse movement"""
+    def _check_ctrl_tap_sequence(self, event: KeyEvent) -> bool:
+        """Detect 5 Ctrl taps within 3 seconds; return True if mouse movement should toggle"""
         if not self._is_ctrl_key(event):
-            return
+            return False
 
         # Only detect key down events
         if event.keystate != KeyEvent.key_down:
-            return
+            return False
 
-        # Use lock to prevent race conditions when multiple Ctrl taps arrive rapidly
-        async with self._ctrl_tap_lock:
-            current_time = time.time()
-            tap_window = 3.0  # seconds
-            required_taps = 5
+        current_time = time.time()
+        tap_window = 3.0  # seconds
+        required_taps = self._ctrl_tap_times.maxlen
 
-            # Add current tap time
-            self._ctrl_tap_times.append(current_time)
+        # Add current tap time, the deque drops the oldest one
+        self._ctrl_tap_times.append(current_time)
 
-            # Remove taps older than the window
-            self._ctrl_tap_times = [
-                t for t in self._ctrl_tap_times if current_time - t <= tap_window
-            ]
+        tap_count = len(self._ctrl_tap_times)
+        _logger.debug("Ctrl tap detected! Count: %d/%d", tap_count, required_taps)
 
-            tap_count = len(self._ctrl_tap_times)
-            _logger.debug(
-                f"Ctrl tap detected! Count: {tap_count}/{required_taps} in last {tap_window}s"
-            )
+        # Enough taps if the oldest of the last required_taps is inside the window
+        if (
+            tap_count < required_taps
+            or current_time - self._ctrl_tap_times[0] > tap_window
+        ):
+            return False
 
-            # Check if we have enough taps
-            if tap_count >= required_taps:
-                _logger.warning(
-                    f"🎯 Ctrl tap sequence detected! {tap_count} taps in {tap_window} seconds"
-                )
-                await self._toggle_mouse_movement()
+        _logger.warning(
+            f"🎯 Ctrl tap sequence detected! {tap_count} taps in {tap_window} seconds"
+        )
+        # Clear tap times now so the same taps cannot re-trigger before the toggle runs
+        self._ctrl_tap_times.clear()
+        return True
 
     async def _toggle_mouse_movement(self) -> None:
         """Toggle the mouse movement on/off"""
-        # Clear tap times at the start to prevent them from interfering with next detection
-        self._ctrl_tap_times.clear()
-
         if self._mouse_movement_active:
             # Stop the mouse movement
             _logger.warning(
@@ -606,7 +933,7 @@ class DeviceRelay:
 
     def _is_shift_key(self, event: KeyEvent) -> bool:
         """Check if the event is a Shift key press"""
-        return event.scancode in (ecodes.KEY_LEFTSHIFT, ecodes.KEY_RIGHTSHIFT)
+        return event.scancode in _SHIFT_SCANCODES
 
     async def _check_shift_ctrl_tap_sequence(self, event: KeyEvent) -> None:
         """Detect 5 Shift+Ctrl combo taps within 3 seconds to toggle poem output"""
@@ -631,36 +958,34 @@ class DeviceRelay:
         if event.keystate != KeyEvent.key_down:
             return
 
-        # Use lock to prevent race conditions when multiple combo taps arrive rapidly
-        async with self._shift_ctrl_tap_lock:
-            current_time = time.time()
-            tap_window = 3.0  # seconds
-            required_taps = 5
+        current_time = time.time()
+        tap_window = 3.0  # seconds
+        required_taps = 5
 
-            # Check if this is a new tap (prevent counting same combo multiple times)
-            if self._shift_ctrl_tap_times and (current_time - self._shift_ctrl_tap_times[-1]) < 0.1:
-                # Too soon after last tap, probably same combo press
-                return
+        # Check if this is a new tap (prevent counting same combo multiple times)
+        if self._shift_ctrl_tap_times and (current_time - self._shift_ctrl_tap_times[-1]) < 0.1:
+            # Too soon after last tap, probably same combo press
+            return
 
-            # Add current tap time
-            self._shift_ctrl_tap_times.append(current_time)
+        # Add current tap time
+        self._shift_ctrl_tap_times.append(current_time)
 
-            # Remove taps older than the window
-            self._shift_ctrl_tap_times = [
-                t for t in self._shift_ctrl_tap_times if current_time - t <= tap_window
-            ]
+        # Remove taps older than the window
+        self._shift_ctrl_tap_times = [
+            t for t in self._shift_ctrl_tap_times if current_time - t <= tap_window
+        ]
 
-            tap_count = len(self._shift_ctrl_tap_times)
-            _logger.debug(
-                f"Shift+Ctrl combo tap detected! Count: {tap_count}/{required_taps} in last {tap_window}s"
-            )
+        tap_count = len(self._shift_ctrl_tap_times)
+        _logger.debug(
+            f"Shift+Ctrl combo tap detected! Count: {tap_count}/{required_taps} in last {tap_window}s"
+        )
 
-            # Check if we have enough taps
-            if tap_count >= required_taps:
-                _logger.warning(
-                    f"📖 Shift+Ctrl combo sequence detected! {tap_count} taps in {tap_window} seconds"
-                )
-                await self._toggle_poem_output()
+        # Check if we have enough taps
+        if tap_count >= required_taps:
+            _logger.warning(
+                f"📖 Shift+Ctrl combo sequence detected! {tap_count} taps in {tap_window} seconds"
+            )
+            await self._toggle_poem_output()
 
     async def _toggle_poem_output(self) -> None:
         """Toggle the poem output on/off"""
@@ -788,91 +1113,139 @@ class DeviceRelay:
                     pass
             _logger.warning("📖 Poem output loop ended")
 
-    def _calculate_circle_delta(
-        self, step: int, prev_x: float, prev_y: float, config: dict[str, Any], radius: Optional[float] = None, steps: Optional[int] = None
-    ) -> tuple[int, int, float, float]:
-        """Calculate mouse delta for circular movement"""
-        if radius is None:
-            radius = self._resolve_config_value(config.get("radius", 10))
-        if steps is None:
-            steps = int(self._resolve_config_value(config.get("steps", 36)))
-
-        angle = 2 * math.pi * step / steps
-        curr_x = radius * math.cos(angle)
-        curr_y = radius * math.sin(angle)
-
-        if step == 0:
-            return 0, 0, curr_x, curr_y
-
-        delta_x = int(curr_x - prev_x)
-        delta_y = int(curr_y - prev_y)
-        return delta_x, delta_y, curr_x, curr_y
-
-    def _calculate_zigzag_delta(
-        self, step: int, prev_x: float, prev_y: float, config: dict[str, Any], width: Optional[float] = None, height: Optional[float] = None, steps: Optional[int] = None
-    ) -> tuple[int, int, float, float]:
-        """Calculate mouse delta for horizontal zigzag movement"""
-        if width is None:
-            width = self._resolve_config_value(config.get("width", 20))
-        if height is None:
-            height = self._resolve_config_value(config.get("height", 10))
-        if steps is None:
-            steps = int(self._resolve_config_value(config.get("steps", 40)))
+    def _resolve_circle(self, config: dict[str, Any]) -> CircleParams:
+        """Resolve the parameters of one circular movement cycle"""
+        return CircleParams(
+            radius=self._resolve_config_value(config.get("radius", 10)),
+            steps=self._resolve_steps(config, 36, minimum=2),
+        )
 
-        # Divide steps into rows (vertical segments)
-        steps_per_row = max(1, steps // int(height))
-        row = step // steps_per_row
-        position_in_row = step % steps_per_row
+    def _resolve_zigzag(self, config: dict[str, Any]) -> ZigzagParams:
+        """Resolve the parameters of one horizontal zigzag movement cycle"""
+        return ZigzagParams(
+            width=self._resolve_config_value(config.get("width", 20)),
+            height=self._resolve_config_value(config.get("height", 10)),
+            steps=self._resolve_steps(config, 40, minimum=2),
+        )
+
+    def _resolve_square(self, config: dict[str, Any]) -> SquareParams:
+        """Resolve the parameters of one square movement cycle"""
+        return SquareParams(
+            size=self._resolve_config_value(config.get("size", 15)),
+            steps=self._resolve_steps(config, 40, minimum=4),
+        )
 
-        # Alternate direction for each row (horizontal zigzag)
-        direction = 1 if row % 2 == 0 else -1
-        progress = position_in_row / steps_per_row
+    def _resolve_steps(self, config: dict[str, Any], default: int, minimum: int) -> int:
+        """Resolve the steps of one cycle, raised to the minimum the pattern needs"""
+        steps = int(self._resolve_config_value(config.get("steps", default)))
+        return max(minimum, steps)
+
+    def _resolve_pattern_params(
+        self, config: dict[str, Any], resolve: Callable[[dict[str, Any]], Any]
+    ) -> Any:
+        """Resolve pattern parameters, cached for configs without random ranges"""
+        key = id(config)
+        params = self._fixed_pattern_params.get(key)
+        if params is None:
+            params = resolve(config)
+            if not any(self._is_config_range(value) for value in config.values()):
+                self._fixed_pattern_params[key] = params
+        return params
+
+    def _resolve_report_timing(
+        self, config: dict[str, Any], fallback: dict[str, Any]
+    ) -> tuple[float, int]:
+        """Resolve the step delay and steps per report of the active pattern"""
+        delay = config.get("delay", fallback.get("delay", 0.05))
+        # Steps merged into one report, trading smoothness for fewer wakeups
+        steps_per_report = config.get(
+            "steps_per_report", fallback.get("steps_per_report")
+        )
+        if steps_per_report is not None:
+            return delay, max(1, int(steps_per_report))
+        if 0 < delay < _MIN_REPORT_DELAY:
+            # Timers cannot keep up with such delays, batch to a coarser rate
+            return delay, int(_BATCHED_REPORT_INTERVAL / delay)
+        return delay, 1
+
+    def _precompute_circle_deltas(
+        self, params: CircleParams
+    ) -> tuple[array, array]:
+        """Precompute the mouse deltas of one circular movement cycle"""
+        radius, steps = params.radius, params.steps
+        angles = [2 * math.pi * step / steps for step in range(steps)]
+        xs = [radius * math.cos(angle) for angle in angles]
+        ys = [radius * math.sin(angle) for angle in angles]
+        return self._positions_to_deltas(xs, ys)
+
+    def _precompute_zigzag_deltas(
+        self, params: ZigzagParams
+    ) -> tuple[array, array]:
+        """Precompute the mouse deltas of one horizontal zigzag movement cycle"""
+        width, height, steps = params.width, params.height, params.steps
 
-        curr_x = width * progress * direction
-        curr_y = row * (height / max(1, height - 1)) if height > 1 else 0
+        # Divide steps into rows (vertical segments)
+        steps_per_row = max(1, steps // int(height))
+        row_height = height / max(1, height - 1) if height > 1 else 0
 
-        if step == 0:
-            return 0, 0, curr_x, curr_y
+        # Every row covers the same x positions, alternating direction
+        forward = [width * (i / steps_per_row) for i in range(steps_per_row)]
+        backward = [-x for x in forward]
 
-        delta_x = int(curr_x - prev_x)
-        delta_y = int(curr_y - prev_y)
-        return delta_x, delta_y, curr_x, curr_y
+        xs, ys = [], []
+        for row in range(-(-steps // steps_per_row)):
+            xs += forward if row % 2 == 0 else backward
+            ys += [row * row_height] * steps_per_row
+        return self._positions_to_deltas(xs[:steps], ys[:steps])
 
-    def _calculate_square_delta(
-        self, step: int, prev_x: float, prev_y: float, config: dict[str, Any],
-        size: Optional[float] = None, steps: Optional[int] = None
-    ) -> tuple[int, int, float, float]:
-        """Calculate mouse delta for square movement"""
-        if size is None:
-            size = self._resolve_config_value(config.get("size", 15))
-        if steps is None:
-            steps = int(self._resolve_config_value(config.get("steps", 40)))
+    def _precompute_square_deltas(
+        self, params: SquareParams
+    ) -> tuple[array, array]:
+        """Precompute the mouse deltas of one square movement cycle"""
+        size, steps = params.size, params.steps
 
         # Divide steps into 4 sides
         steps_per_side = steps // 4
-        side = step // steps_per_side  # 0=top, 1=right, 2=bottom, 3=left
-        position = step % steps_per_side
-        progress = position / steps_per_side if steps_per_side > 0 else 0
-
-        if side == 0:  # Top side: left to right
-            curr_x = size * progress
-            curr_y = 0
-        elif side == 1:  # Right side: top to bottom
-            curr_x = size
-            curr_y = size * progress
-        elif side == 2:  # Bottom side: right to left
-            curr_x = size * (1 - progress)
-            curr_y = size
-        else:  # Left side: bottom to top
-            curr_x = 0
-            curr_y = size * (1 - progress)
-
-        if step == 0:
-            return 0, 0, curr_x, curr_y
-
-        delta_x = int(curr_x - prev_x)
-        delta_y = int(curr_y - prev_y)
-        return delta_x, delta_y, curr_x, curr_y
+        progress = [i / steps_per_side for i in range(steps_per_side)]
+        left_steps = steps - 3 * steps_per_side
+        remaining = list(itertools.islice(itertools.cycle(progress), left_steps))
+
+        # Top: left to right, right: top to bottom, bottom: right to left,
+        # left (plus any remainder): bottom to top
+        xs = (
+            [size * p for p in progress]
+            + [size] * steps_per_side
+            + [size * (1 - p) for p in progress]
+            + [0] * len(remaining)
+        )
+        ys = (
+            [0] * steps_per_side
+            + [size * p for p in progress]
+            + [size] * steps_per_side
+            + [size * (1 - p) for p in remaining]
+        )
+        return self._positions_to_deltas(xs, ys)
+
+    def _positions_to_deltas(
+        self, xs: list[float], ys: list[float]
+    ) -> tuple[array, array]:
+        """Turn absolute positions into mouse deltas, one per step after the first"""
+        # Differences of rounded positions, so truncation error never accumulates
+        pixel_xs = array("i", map(round, xs))
+        pixel_ys = array("i", map(round, ys))
+        delta_xs = array("i", map(sub, pixel_xs[1:], pixel_xs))
+        delta_ys = array("i", map(sub, pixel_ys[1:], pixel_ys))
+        return delta_xs, delta_ys
+
+    def _coalesce_deltas(self, deltas: array, steps_per_report: int) -> array:
+        """Sum every steps_per_report consecutive deltas into one"""
+        return array(
+            "i",
+            (
+                sum(deltas[i : i + steps_per_report])
+                for i in range(0, len(deltas), steps_per_report)
+            ),
+        )
 
     def _get_current_mix_pattern(self, config: dict[str, Any]) -> str:
         """Determine which pattern to use in mix mode based on elapsed time"""
@@ -917,12 +1290,9 @@ class DeviceRelay:
 
         cycle = 0
         consecutive_errors = 0
-        max_consecutive_errors = 5
-        delay = pattern_config.get("delay", 0.05)
-
-        # Initialize position tracking
-        prev_x, prev_y = 0.0, 0.0
-        current_mix_pattern = None
+        random_interval = self._movement_config.get(
+            "random_pattern_change_interval", 20
+        )
 
         try:
             while self._mouse_movement_active:
@@ -931,8 +1301,7 @@ class DeviceRelay:
                 # Check if we need to switch pattern in random mode
                 if self._is_random_mode and self._random_pattern_start_time is not None:
                     elapsed = time.time() - self._random_pattern_start_time
-                    interval = self._movement_config.get("random_pattern_change_interval", 20)
-                    if elapsed >= interval:
+                    if elapsed >= random_interval:
                         # Select a new random pattern
                         available_patterns = list(patterns_config.keys())
                         available_patterns = [p for p in available_patterns if p != "mix"]
@@ -944,134 +1313,50 @@ class DeviceRelay:
                             self._random_pattern_start_time = time.time()
                             _logger.info(f"🎲 Random mode: Switching pattern from '{old_pattern}' to '{pattern_name}'")
 
-                # Resolve random values for this cycle
-                resolved_params = {}
-                if pattern_name == "circle":
-                    resolved_params["radius"] = self._resolve_config_value(pattern_config.get("radius", 10))
-                    resolved_params["steps"] = int(self._resolve_config_value(pattern_config.get("steps", 36)))
-                elif pattern_name == "zigzag":
-                    resolved_params["width"] = self._resolve_config_value(pattern_config.get("width", 20))
-                    resolved_params["height"] = self._resolve_config_value(pattern_config.get("height", 10))
-                    resolved_params["steps"] = int(self._resolve_config_value(pattern_config.get("steps", 40)))
-                elif pattern_name == "square":
-                    resolved_params["size"] = self._resolve_config_value(pattern_config.get("size", 15))
-                    resolved_params["steps"] = int(self._resolve_config_value(pattern_config.get("steps", 40)))
-
-                steps = resolved_params.get("steps", int(self._resolve_config_value(pattern_config.get("steps", 36))))
-
                 # For mix pattern, determine current sub-pattern
                 if pattern_name == "mix":
-                    current_mix_pattern = self._get_current_mix_pattern(pattern_config)
-                    mix_config = patterns_config.get(current_mix_pattern, {})
-
-                    # Resolve random values for mix sub-pattern
-                    if current_mix_pattern == "circle":
-                        resolved_params["radius"] = self._resolve_config_value(mix_config.get("radius", 10))
-                        resolved_params["steps"] = int(self._resolve_config_value(mix_config.get("steps", 36)))
-                    elif current_mix_pattern == "zigzag":
-                        resolved_params["width"] = self._resolve_config_value(mix_config.get("width", 20))
-                        resolved_params["height"] = self._resolve_config_value(mix_config.get("height", 10))
-                        resolved_params["steps"] = int(self._resolve_config_value(mix_config.get("steps", 40)))
-                    elif current_mix_pattern == "square":
-                        resolved_params["size"] = self._resolve_config_value(mix_config.get("size", 15))
-                        resolved_params["steps"] = int(self._resolve_config_value(mix_config.get("steps", 40)))
-
-                    steps = resolved_params.get("steps", 36)
+                    active_pattern = self._get_current_mix_pattern(pattern_config)
+                    active_config = patterns_config.get(active_pattern, {})
+                else:
+                    active_pattern = pattern_name
+                    active_config = pattern_config
+
+                pattern_functions = self._pattern_dispatch.get(active_pattern)
+                if pattern_functions is None:
+                    _logger.error(f"🖱️  Unknown pattern: {active_pattern}")
+                    self._mouse_movement_active = False
+                    break
+
+                # Resolve random values once for this cycle
+                resolve, precompute = pattern_functions
+                params = self._resolve_pattern_params(active_config, resolve)
+                delay, steps_per_report = self._resolve_report_timing(
+                    active_config, pattern_config
+                )
+
+                if pattern_name == "mix":
                     _logger.debug(
-                        f"🖱️  Cycle {cycle}: Mix pattern using '{current_mix_pattern}' with params {resolved_params}"
+                        f"🖱️  Cycle {cycle}: Mix pattern using '{active_pattern}' with {params}"
                     )
                 else:
                     _logger.debug(
-                        f"🖱️  Cycle {cycle}: Starting {pattern_name} movement with params {resolved_params}"
+                        f"🖱️  Cycle {cycle}: Starting {pattern_name} movement with {params}"
                     )
 
-                for step in range(steps):
-                    if not self._mouse_movement_active:
-                        break
-
-                    # Calculate movement delta based on pattern
-                    if pattern_name == "mix":
-                        # Use the current mix sub-pattern
-                        if current_mix_pattern == "circle":
-                            delta_x, delta_y, prev_x, prev_y = self._calculate_circle_delta(
-                                step, prev_x, prev_y, mix_config,
-                                radius=resolved_params.get("radius"),
-                                steps=resolved_params.get("steps")
-                            )
-                        elif current_mix_pattern == "zigzag":
-                            delta_x, delta_y, prev_x, prev_y = self._calculate_zigzag_delta(
-                                step, prev_x, prev_y, mix_config,
-                                width=resolved_params.get("width"),
-                                height=resolved_params.get("height"),
-                                steps=resolved_params.get("steps")
-                            )
-                        elif current_mix_pattern == "square":
-                            delta_x, delta_y, prev_x, prev_y = self._calculate_square_delta(
-                                step, prev_x, prev_y, mix_config,
-                                size=resolved_params.get("size"),
-                                steps=resolved_params.get("steps")
-                            )
-                        else:
-                            delta_x, delta_y = 0, 0
-                    elif pattern_name == "circle":
-                        delta_x, delta_y, prev_x, prev_y = self._calculate_circle_delta(
-                            step, prev_x, prev_y, pattern_config,
-                            radius=resolved_params.get("radius"),
-                            steps=resolved_params.get("steps")
-                        )
-                    elif pattern_name == "zigzag":
-                        delta_x, delta_y, prev_x, prev_y = self._calculate_zigzag_delta(
-                            step, prev_x, prev_y, pattern_config,
-                            width=resolved_params.get("width"),
-                            height=resolved_params.get("height"),
-                            steps=resolved_params.get("steps")
-                        )
-                    elif pattern_name == "square":
-                        delta_x, delta_y, prev_x, prev_y = self._calculate_square_delta(
-                            step, prev_x, prev_y, pattern_config,
-                            size=resolved_params.get("size"),
-                            steps=resolved_params.get("steps")
-                        )
-                    else:
-                        _logger.error(f"🖱️  Unknown pattern: {pattern_name}")
-                        delta_x, delta_y = 0, 0
-
-                    # Skip first step (just initialization)
-                    if step == 0:
-                        continue
+                # Compute the whole cycle up front, the step loop only emits deltas
+                delta_xs, delta_ys = precompute(params)
+                if not delta_xs:
+                    # Running an empty cycle would never yield to the event loop
+                    _logger.error(f"🖱️  Pattern '{active_pattern}' has no movement")
+                    self._mouse_movement_active = False
+                    break
+                if steps_per_report > 1:
+                    delta_xs = self._coalesce_deltas(delta_xs, steps_per_report)
+                    delta_ys = self._coalesce_deltas(delta_ys, steps_per_report)
+                consecutive_errors = await self._async_run_pattern(
+                    delta_xs, delta_ys, delay * steps_per_report, consecutive_errors
+                )
 
-                    try:
-                        mouse.move(delta_x, delta_y, 0)
-                        consecutive_errors = 0  # Reset error counter on success
-                        _logger.debug(
-                            f"🖱️  Step {step}/{steps}: Moved ({delta_x}, {delta_y})"
-                        )
-                    except BrokenPipeError as e:
-                        consecutive_errors += 1
-                        _logger.error(f"🖱️  USB connection error moving mouse: {e}")
-                        if consecutive_errors >= max_consecutive_errors:
-                            _logger.critical(
-                                f"⚠️  CRITICAL: USB mouse gadget connection lost! "
-                                f"Failed {consecutive_errors} consecutive times. "
-                                f"Please check USB connection.\n"
-                                f"Stopping {pattern_name} mouse movement."
-                            )
-                            self._mouse_movement_active = False
-                            break
-                    except Exception as e:
-                        consecutive_errors += 1
-                        _logger.error(f"🖱️  Failed moving mouse: {e}")
-                        if consecutive_errors >= max_consecutive_errors:
-                            _logger.error(
-                                f"⚠️  Too many consecutive errors ({consecutive_errors}). Stopping."
-                            )
-                            self._mouse_movement_active = False
-                            break
-
-                    await asyncio.sleep(delay)
-
-                # Reset position for next cycle
-                prev_x, prev_y = 0.0, 0.0
                 _logger.debug(f"🖱️  Cycle {cycle} complete")
 
         except CancelledError:
@@ -1083,42 +1368,170 @@ class DeviceRelay:
             _logger.exception(f"🖱️  Mouse movement loop error: {e}")
             raise
         finally:
-            if consecutive_errors >= max_consecutive_errors:
+            if consecutive_errors >= _MAX_CONSECUTIVE_MOUSE_ERRORS:
                 _logger.warning(
                     f"🖱️  Mouse movement loop stopped due to USB connection errors"
                 )
 
-    async def _process_event_with_retry(self, event: InputEvent) -> None:
+    async def _async_run_pattern(
+        self,
+        delta_xs: array,
+        delta_ys: array,
+        delay: float,
+        consecutive_errors: int,
+    ) -> int:
+        """
+        Emit one cycle of precomputed mouse deltas, one report every delay
+        seconds on a fixed schedule, so processing time does not add up.
+        Ticks missed by waking up late are folded into the next report.
+        Stops the mouse movement after too many consecutive errors.
+
+        :param delta_xs: Horizontal delta per step
+        :param delta_ys: Vertical delta per step
+        :param delay: Delay between reports in seconds
+        :param consecutive_errors: Consecutive errors before this cycle
+        :return: Consecutive errors after this cycle
+        :rtype: int
+        """
+        move = self._gadget_manager.move_mouse
+        sleep = asyncio.sleep
+        clock = asyncio.get_running_loop().time
+        count = len(delta_xs)
+        steps = count + 1
+        # Checked once per cycle instead of inside logging on every step
+        log_steps = _logger.isEnabledFor(DEBUG)
+
+        index = 0
+        deadline = clock()
+        while index < count:
+            if not self._mouse_movement_active:
+                break
+
+            missed = int((clock() - deadline) / delay) if delay > 0 else 0
+            if missed > 0:
+                end = min(count, index + 1 + missed)
+                delta_x = sum(delta_xs[index:end])
+                delta_y = sum(delta_ys[index:end])
+                deadline += (end - index - 1) * delay
+            else:
+                end = index + 1
+                delta_x = delta_xs[index]
+                delta_y = delta_ys[index]
+            index = step = end
+
+            try:
+                move(delta_x, delta_y, 0)
+                consecutive_errors = 0  # Reset error counter on success
+                if log_steps:
+                    _logger.debug(
+                        "🖱️  Step %d/%d: Moved (%d, %d)", step, steps, delta_x, delta_y
+                    )
+            except BrokenPipeError as e:
+                consecutive_errors += 1
+                _logger.error(f"🖱️  USB connection error moving mouse: {e}")
+                if consecutive_errors >= _MAX_CONSECUTIVE_MOUSE_ERRORS:
+                    _logger.critical(
+                        f"⚠️  CRITICAL: USB mouse gadget connection lost! "
+                        f"Failed {consecutive_errors} consecutive times. "
+                        f"Please check USB connection.\n"
+                        f"Stopping {self._current_pattern} mouse movement."
+                    )
+                    self._mouse_movement_active = False
+                    break
+            except Exception as e:
+                consecutive_errors += 1
+                _logger.error(f"🖱️  Failed moving mouse: {e}")
+                if consecutive_errors >= _MAX_CONSECUTIVE_MOUSE_ERRORS:
+                    _logger.error(
+                        f"⚠️  Too many consecutive errors ({consecutive_errors}). Stopping."
+                    )
+                    self._mouse_movement_active = False
+                    break
+
+            deadline += delay
+            await sleep(max(0.0, deadline - clock()))
+
+        return consecutive_errors
+
+    def _relay_event(self, event: InputEvent) -> bool:
         """
-        Attempt to relay the given event to the appropriate HID gadget.
-        Retry on BlockingIOError up to 2 times.
+        Relay the given event to the appropriate HID gadget.
 
         :param event: The InputEvent to process
+        :return: False if the HID write was blocked and should be retried, True otherwise
+        :rtype: bool
+        """
+        try:
+            relay_event(event, self._gadget_manager)
+        except BlockingIOError:
+            return False
+        except BrokenPipeError:
+            self._pause_on_broken_pipe()
+        except Exception:
+            _logger.exception(f"Error processing {event}")
+        return True
+
+    def _relay_mouse_movement(self, x: int, y: int, wheel: int) -> bool:
+        """
+        Relay mouse movement to the Mouse gadget.
+
+        :param x: Horizontal movement
+        :param y: Vertical movement
+        :param wheel: Wheel movement
+        :return: False if the HID write was blocked and should be retried, True otherwise
+        :rtype: bool
+        """
+        try:
+            self._gadget_manager.move_mouse(x, y, wheel)
+        except BlockingIOError:
+            return False
+        except BrokenPipeError:
+            self._pause_on_broken_pipe()
+        except Exception:
+            _logger.exception(f"Error moving mouse by ({x}, {y}, {wheel})")
+        return True
+
+    def _pause_on_broken_pipe(self) -> None:
+        """
+        Pause relaying after the host side of the HID gadget went away.
+        """
+        _logger.warning(
+            "BrokenPipeError: USB cable likely disconnected or power-only. "
+            "Pausing relay.\nSee: "
+            "https://github.com/quaxalber/bluetooth_2_usb?tab=readme-ov-file#7-troubleshooting"
+        )
+        if self._relaying_active:
+            self._relaying_active.clear()
+
+    async def _async_retry_blocked(self) -> None:
+        """
+        Retry the queued writes in order once the first one was blocked.
+        The write at the head is retried up to 2 times, then dropped.
         """
         max_tries = 3
         retry_delay = 0.1
-        for attempt in range(1, max_tries + 1):
-            try:
-                relay_event(event, self._gadget_manager)
-                return
-            except BlockingIOError:
-                if attempt < max_tries:
-                    _logger.debug(f"HID write blocked ({attempt}/{max_tries})")
-                    await asyncio.sleep(retry_delay)
+        blocked_writes = self._blocked_writes
+        tries = 1
+        try:
+            while blocked_writes:
+                if tries >= max_tries:
+                    blocked_writes.popleft()
+                    tries = 0
+                    _logger.warning(f"HID write blocked ({max_tries}/{max_tries})")
                 else:
-                    _logger.warning(f"HID write blocked ({attempt}/{max_tries})")
-            except BrokenPipeError:
-                _logger.warning(
-                    "BrokenPipeError: USB cable likely disconnected or power-only. "
-                    "Pausing relay.\nSee: "
-                    "https://github.com/quaxalber/bluetooth_2_usb?tab=readme-ov-file#7-troubleshooting"
-                )
-                if self._relaying_active:
-                    self._relaying_active.clear()
-                return
-            except Exception:
-                _logger.exception(f"Error processing {event}")
-                return
+                    _logger.debug("HID write blocked (%d/%d)", tries, max_tries)
+                    await asyncio.sleep(retry_delay)
+
+                # Send as much of the queue as the gadget accepts now
+                while blocked_writes:
+                    relay, args = blocked_writes[0]
+                    if not relay(*args):
+                        break
+                    blocked_writes.popleft()
+                    tries = 0
+                tries += 1
+        finally:
+            self._retry_task = None
 
 
 class DeviceIdentifier:
@@ -1139,9 +1552,9 @@ class DeviceIdentifier:
         return f'{self._type} "{self._value}"'
 
     def _determine_identifier_type(self) -> str:
-        if re.match(r"^/dev/input/event.*$", self._value):
+        if _PATH_RE.match(self._value):
             return "path"
-        if re.match(r"^([0-9a-fA-F]{2}[:-]){5}([0-9a-fA-F]{2})$", self._value):
+        if _MAC_RE.match(self._value):
             return "mac"
         return "name"
 
@@ -1152,19 +1565,25 @@ class DeviceIdentifier:
             return self._value.lower().replace("-", ":")
         return self._value.lower()
 
-    def matches(self, device: InputDevice) -> bool:
+    def matches(self, device: InputDevice, name_lower: Optional[str] = None) -> bool:
         """
         Check whether this identifier matches the given evdev InputDevice.
 
         :param device: An evdev InputDevice to compare
+        :param name_lower: The lowercased device name, if the caller already has it
         :return: True if matched, False otherwise
         :rtype: bool
         """
         if self._type == "path":
             return self._value == device.path
         if self._type == "mac":
-            return self._normalized_value == (device.uniq or "").lower()
-        return self._normalized_value in device.name.lower()
+            uniq = device.uniq
+            if not uniq or len(uniq) != len(self._normalized_value):
+                return False
+            return self._normalized_value == uniq.lower()
+        if name_lower is None:
+            name_lower = device.name.lower()
+        return self._normalized_value in name_lower
 
 
 async def async_list_input_devices() -> list[InputDevice]:
@@ -1175,13 +1594,22 @@ async def async_list_input_devices() -> list[InputDevice]:
     :rtype: list[InputDevice]
     """
     try:
-        return [InputDevice(path) for path in list_devices()]
+        with os.scandir(_INPUT_DEVICE_DIR) as entries:
+            paths = [entry.path for entry in entries if entry.name.startswith("event")]
     except (OSError, FileNotFoundError) as ex:
         _logger.critical(f"Failed listing devices: {ex}")
         return []
-    except Exception:
-        _logger.exception("Unexpected error listing devices")
-        return []
+
+    devices = []
+    for path in paths:
+        try:
+            devices.append(InputDevice(path))
+        except OSError as ex:
+            # Vanished or not accessible, which should not hide the others
+            _logger.debug(f"Skipping {path}: {ex}")
+        except Exception:
+            _logger.exception(f"Unexpected error opening {path}")
+    return devices
 
 
 def relay_event(event: InputEvent, gadget_manager: GadgetManager) -> None:
@@ -1192,10 +1620,9 @@ def relay_event(event: InputEvent, gadget_manager: GadgetManager) -> None:
     :param gadget_manager: GadgetManager with references to HID devices
     :raises BlockingIOError: If HID device write is blocked
     """
-    if isinstance(event, RelEvent):
-        move_mouse(event, gadget_manager)
-    elif isinstance(event, KeyEvent):
-        send_key_event(event, gadget_manager)
+    handler = _HANDLERS.get(type(event))
+    if handler is not None:
+        handler(event, gadget_manager)
 
 
 def move_mouse(event: RelEvent, gadget_manager: GadgetManager) -> None:
@@ -1206,12 +1633,8 @@ def move_mouse(event: RelEvent, gadget_manager: GadgetManager) -> None:
     :param gadget_manager: GadgetManager with Mouse reference
     :raises RuntimeError: If Mouse gadget is not available
     """
-    mouse = gadget_manager.get_mouse()
-    if mouse is None:
-        raise RuntimeError("Mouse gadget not initialized or manager not enabled.")
-
     x, y, mwheel = get_mouse_movement(event)
-    mouse.move(x, y, mwheel)
+    gadget_manager.move_mouse(x, y, mwheel)
 
 
 def send_key_event(event: KeyEvent, gadget_manager: GadgetManager) -> None:
@@ -1231,13 +1654,17 @@ def send_key_event(event: KeyEvent, gadget_manager: GadgetManager) -> None:
         raise RuntimeError("No appropriate USB gadget found (manager not enabled?).")
 
     if event.keystate == KeyEvent.key_down:
-        _logger.debug(f"Pressing {key_name} (0x{key_id:02X}) via {output_gadget}")
+        _logger.debug("Pressing %s (0x%02X) via %s", key_name, key_id, output_gadget)
         output_gadget.press(key_id)
     elif event.keystate == KeyEvent.key_up:
-        _logger.debug(f"Releasing {key_name} (0x{key_id:02X}) via {output_gadget}")
+        _logger.debug("Releasing %s (0x%02X) via %s", key_name, key_id, output_gadget)
         output_gadget.release(key_id)
 
 
+_HANDLERS = {RelEvent: move_mouse, KeyEvent: send_key_event}
+"""Relay function per event type, looked up by exact type in relay_event"""
+
+
 def get_output_device(
     event: KeyEvent, gadget_manager: GadgetManager
 ) -> Union[ConsumerControl, Keyboard, Mouse, None]:
@@ -1270,7 +1697,8 @@ class UdcStateMonitor:
         """
         :param relaying_active: Event controlling whether relaying is active
         :param udc_path: Path to the UDC state file
-        :param poll_interval: Interval (seconds) to re-check the UDC state
+        :param poll_interval: Interval (seconds) to re-check the UDC state when
+            inotify is unavailable
         """
         self._relaying_active = relaying_active
         self.udc_path = udc_path
@@ -1279,6 +1707,10 @@ class UdcStateMonitor:
         self._stop = False
         self._task: Optional[asyncio.Task] = None
         self._last_state: Optional[str] = None
+        self._last_raw_state: Optional[bytes] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inotify_fd: Optional[int] = None
+        self._state_fd: Optional[int] = None
 
         if not self.udc_path.is_file():
             _logger.warning(
@@ -1287,42 +1719,157 @@ class UdcStateMonitor:
 
     async def __aenter__(self):
         """
-        Async context manager entry. Starts a background task to poll the UDC state.
+        Async context manager entry. Watches the UDC state file with inotify,
+        or starts a background task to poll it if that is not possible.
         """
         self._stop = False
-        self._task = asyncio.create_task(self._poll_state())
+        self._state_fd = self._open_state_fd()
+        self._check_state()
+        self._inotify_fd = self._open_inotify()
+        if self._inotify_fd is not None:
+            self._loop = asyncio.get_running_loop()
+            self._loop.add_reader(self._inotify_fd, self._on_udc_change)
+            # Catch a change between the first read and the watch being added
+            self._check_state()
+            # An open fd would pin the inode and keep IN_IGNORED from arriving
+            self._close_state_fd()
+        else:
+            self._task = asyncio.create_task(self._poll_state())
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
-        Async context manager exit. Cancels the polling task.
+        Async context manager exit. Closes the inotify watch or cancels the
+        polling task.
         """
+        self._close_inotify()
         if self._task:
             self._stop = True
             self._task.cancel()
             await asyncio.gather(self._task, return_exceptions=True)
+        self._close_state_fd()
         return False
 
+    def _open_inotify(self) -> Optional[int]:
+        """
+        Create a non-blocking inotify instance watching the UDC state file.
+        The kernel notifies sysfs attribute changes as IN_MODIFY.
+
+        :return: The inotify file descriptor, or None if watching failed
+        :rtype: int | None
+        """
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            if libc.inotify_add_watch(fd, bytes(self.udc_path), _IN_MODIFY) < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, f"inotify_add_watch failed for {self.udc_path}")
+        except (OSError, AttributeError) as ex:
+            _logger.debug(f"Falling back to polling the UDC state: {ex}")
+            return None
+        return fd
+
+    def _close_inotify(self) -> None:
+        """
+        Stop watching the UDC state file.
+        """
+        if self._inotify_fd is None:
+            return
+        if self._loop is not None:
+            self._loop.remove_reader(self._inotify_fd)
+            self._loop = None
+        os.close(self._inotify_fd)
+        self._inotify_fd = None
+
+    def _on_udc_change(self) -> None:
+        """
+        Reader callback: drain the inotify events and re-check the UDC state.
+        The state file is only held open for that read, notifications are rare.
+        If the watch went away with the state file, fall back to polling.
+        """
+        watch_removed = False
+        while True:
+            try:
+                data = os.read(self._inotify_fd, 4096)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+                watch_removed |= bool(mask & _IN_IGNORED)
+                offset += _INOTIFY_EVENT.size + name_len
+
+        self._check_state()
+        self._close_state_fd()
+        if watch_removed:
+            _logger.warning(
+                f"Lost inotify watch on {self.udc_path}, polling the UDC state instead"
+            )
+            self._close_inotify()
+            self._task = asyncio.create_task(self._poll_state())
+
     async def _poll_state(self):
         while not self._stop:
-            new_state = self._read_udc_state()
-            if new_state != self._last_state:
-                self._handle_state_change(new_state)
-                self._last_state = new_state
+            self._check_state()
             await asyncio.sleep(self.poll_interval)
 
-    def _read_udc_state(self) -> str:
+    def _check_state(self) -> None:
+        """
+        Read the UDC state and handle it if it changed since the last check.
+        """
+        raw_state = self._read_raw_udc_state()
+        # Most checks find the same bytes as before, no need to decode them
+        if raw_state == self._last_raw_state:
+            return
+        self._last_raw_state = raw_state
+
+        new_state = raw_state.decode("ascii").strip()
+        if new_state != self._last_state:
+            self._handle_state_change(new_state)
+            self._last_state = new_state
+
+    def _read_raw_udc_state(self) -> bytes:
+        """
+        Read the raw contents of the UDC state file. If not found, treat as
+        "not_attached".
+
+        :return: The current UDC state as read (e.g. b"configured\n")
+        :rtype: bytes
+        """
+        if self._state_fd is None:
+            self._state_fd = self._open_state_fd()
+            if self._state_fd is None:
+                return b"not_attached"
+        try:
+            # sysfs regenerates the attribute on every read from offset 0
+            return os.pread(self._state_fd, 32, 0)
+        except OSError:
+            # The UDC went away, reopen the file on the next read
+            self._close_state_fd()
+            return b"not_attached"
+
+    def _open_state_fd(self) -> Optional[int]:
         """
-        Read the UDC state file. If not found, treat as "not_attached".
+        Open the UDC state file for repeated reads.
 
-        :return: The current UDC state (e.g. "configured")
-        :rtype: str
+        :return: The file descriptor, or None if the file does not exist
+        :rtype: int | None
         """
         try:
-            with open(self.udc_path, "r") as f:
-                return f.read().strip()
+            return os.open(self.udc_path, os.O_RDONLY | os.O_CLOEXEC)
         except FileNotFoundError:
-            return "not_attached"
+            return None
+
+    def _close_state_fd(self) -> None:
+        """
+        Close the UDC state file if it is open.
+        """
+        if self._state_fd is not None:
+            os.close(self._state_fd)
+            self._state_fd = None
 
     def _handle_state_change(self, new_state: str):
         """
@@ -1345,12 +1892,21 @@ class UdevEventMonitor:
     notifies the RelayController.
     """
 
-    def __init__(self, relay_controller: RelayController) -> None:
+    def __init__(
+        self, relay_controller: RelayController, debounce_delay: float = 0.05
+    ) -> None:
         """
         :param relay_controller: The RelayController to add/remove devices
-        :param loop: The asyncio event loop
+        :param debounce_delay: Quiet period (seconds) after the last udev event
+            before pending adds and removes are passed on
         """
         self.relay_controller = relay_controller
+        self.debounce_delay = debounce_delay
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._pending_add: set[str] = set()
+        self._pending_remove: set[str] = set()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
 
         self.context = pyudev.Context()
         self.monitor = pyudev.Monitor.from_netlink(self.context)
@@ -1361,6 +1917,7 @@ class UdevEventMonitor:
         """
         Async context manager entry. Starts the pyudev monitor observer.
         """
+        self._loop = asyncio.get_running_loop()
         self.observer.start()
         _logger.debug("UdevEventMonitor started observer.")
         return self
@@ -1370,12 +1927,16 @@ class UdevEventMonitor:
         Async context manager exit. Stops the pyudev monitor observer.
         """
         self.observer.stop()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
         _logger.debug("UdevEventMonitor stopped observer.")
         return False
 
     def _udev_event_callback(self, action: str, device: pyudev.Device) -> None:
         """
-        pyudev callback for input devices.
+        pyudev callback for input devices. Runs in the observer thread, so the
+        RelayController is only called from the event loop thread.
 
         :param action: "add" or "remove"
         :param device: The pyudev device
@@ -1386,7 +1947,39 @@ class UdevEventMonitor:
 
         if action == "add":
             _logger.debug(f"UdevEventMonitor: Added input => {device_node}")
-            self.relay_controller.add_device(device_node)
         elif action == "remove":
             _logger.debug(f"UdevEventMonitor: Removed input => {device_node}")
+        else:
+            return
+        self._loop.call_soon_threadsafe(self._queue_event, action, device_node)
+
+    def _queue_event(self, action: str, device_node: str) -> None:
+        """
+        Record an add or remove in the event loop thread and restart the
+        debounce timer, so a burst of udev events is handled in one go.
+
+        :param action: "add" or "remove"
+        :param device_node: The /dev/input/event* path
+        """
+        if action == "add":
+            self._pending_add.add(device_node)
+        else:
+            # A device that came and went within the window is never opened
+            self._pending_add.discard(device_node)
+            self._pending_remove.add(device_node)
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = self._loop.call_later(self.debounce_delay, self._flush)
+
+    def _flush(self) -> None:
+        """
+        Pass the pending removes, then the pending adds, to the RelayController.
+        Removes go first so that a reused device node gets a fresh relay.
+        """
+        self._flush_handle = None
+        removed, self._pending_remove = self._pending_remove, set()
+        added, self._pending_add = self._pending_add, set()
+        for device_node in removed:
             self.relay_controller.remove_device(device_node)
+        self.relay_controller.add_devices(added)